@@ -3,6 +3,18 @@ import os
 MODEL_NAME = "gemini-2.5-pro-preview-03-25"
 MAX_POM_READ_BYTES = 1024 * 5
 MAX_CODE_READ_CHARS = 25000
+# "tree-sitter" uses tree-sitter-java when it is installed; "javalang" forces javalang.
+JAVA_PARSER = os.getenv("GEMIGRATOR_JAVA_PARSER", "tree-sitter")
+# Build-output directories the project scan lists but does not descend into.
+# They are only pruned at the project root or next to a build file (pom.xml,
+# build.gradle), so packages such as com.example.build are still scanned.
+SCAN_PRUNE_DIRS = frozenset({"target", "build", "out", "bin", "node_modules"})
+# Hidden directories (.git, .idea, .gradle, ...) are skipped at any depth,
+# except those listed here.
+SCAN_KEEP_HIDDEN_DIRS = frozenset({".mvn"})
+# Threads listing directories during the project scan. 1 walks serially; more
+# helps on high-latency filesystems (network mounts, container bind mounts).
+SCAN_MAX_WORKERS = int(os.getenv("GEMIGRATOR_SCAN_WORKERS", "1"))
 
 
 def load_api_key():
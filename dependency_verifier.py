@@ -1,17 +1,94 @@
+import functools
+import shelve
+import threading
+import time
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
-import xml.etree.ElementTree as ET
 import logging
 
+try:
+    from lxml import etree as ET
+
+    _LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    _LXML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 MAVEN_SEARCH_URL = "https://search.maven.org/solrsearch/select"
+MAVEN_CACHE_FILE_NAME = ".maven_cache"
+MAVEN_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+_DEP_RE = re.compile(
+    r"<groupId>(.*?)</groupId>\s*<artifactId>(.*?)</artifactId>\s*(?:<version>(.*?)</version>)?",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# groupIds the LLM emits as stand-ins; these never exist on Maven Central.
+_PLACEHOLDER_GROUPS = frozenset(
+    {"com.example", "org.example", "your.group", "your.group.id", "groupId"}
+)
+_PLACEHOLDER_GROUP_RE = re.compile(r"^[a-z]+\.(example|sample|placeholder)$")
+
+_maven_cache_lock = threading.Lock()
+# lxml parsers must not be shared between threads, so keep one per thread.
+_xml_parsers = threading.local()
+
+# Shared across verification threads so connections to Maven Central are
+# reused; throttling responses are retried with backoff by the adapter.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]
+        ),
+    ),
+)
+
+
+def _get_xml_parser():
+    """Returns this thread's recovering lxml parser, or None for the stdlib default."""
+    if not _LXML_AVAILABLE:
+        return None
+    parser = getattr(_xml_parsers, "parser", None)
+    if parser is None:
+        parser = _xml_parsers.parser = ET.XMLParser(recover=True)
+    return parser
+
+
+def _parse_dependency_with_regex(snippet: str) -> dict | None:
+    """Extracts groupId/artifactId/version from a snippet that is not valid XML."""
+    dep_match = _DEP_RE.search(snippet)
+    if dep_match:
+        group_id, artifact_id, version = dep_match.groups()
+        return {
+            "group_id": group_id.strip() if group_id else None,
+            "artifact_id": artifact_id.strip() if artifact_id else None,
+            "version": version.strip() if version else None,
+            "snippet": snippet,
+        }
+    return None
 
 
 def parse_dependency_snippet(snippet: str) -> dict | None:
-    """Parses a Maven <dependency> XML snippet."""
+    """Parses a Maven <dependency> XML snippet.
+    Uses lxml's recovering parser when installed, otherwise ElementTree.
+    """
     try:
-        root = ET.fromstring(f"<root>{snippet}</root>")
+        root = ET.fromstring(f"<root>{snippet}</root>", _get_xml_parser())
+        if root is None:
+            logger.warning(
+                f"XML parse failed for snippet, falling back to regex: {snippet[:50]}..."
+            )
+            return _parse_dependency_with_regex(snippet)
         dep = root.find("dependency")
         if dep is None:
             return None
@@ -36,27 +113,88 @@ def parse_dependency_snippet(snippet: str) -> dict | None:
         logger.warning(
             f"XML parse failed for snippet, falling back to regex: {snippet[:50]}..."
         )
-        dep_match = re.search(
-            r"<groupId>(.*?)</groupId>\s*<artifactId>(.*?)</artifactId>\s*(?:<version>(.*?)</version>)?",
-            snippet,
-            re.DOTALL | re.IGNORECASE,
-        )
-        if dep_match:
-            group_id, artifact_id, version = dep_match.groups()
-            return {
-                "group_id": group_id.strip() if group_id else None,
-                "artifact_id": artifact_id.strip() if artifact_id else None,
-                "version": version.strip() if version else None,
-                "snippet": snippet,
-            }
-        return None
+        return _parse_dependency_with_regex(snippet)
     except Exception as e:
         logger.error(f"Error parsing dependency snippet: {e}")
         return None
 
 
-def verify_maven_dependency(dep_info: dict) -> dict:
-    """Verifies a parsed dependency against Maven Central Search API."""
+def is_placeholder_dependency(dep_info: dict) -> bool:
+    """Returns True for obviously synthetic coordinates such as com.example."""
+    group_id = dep_info["group_id"]
+    return group_id in _PLACEHOLDER_GROUPS or bool(
+        _PLACEHOLDER_GROUP_RE.match(group_id)
+    )
+
+
+def _read_maven_cache(cache_dir: Path, key: str) -> tuple[bool, str | None] | None:
+    """Returns a cached (exists, latest_version) entry if it is still fresh."""
+    try:
+        with (
+            _maven_cache_lock,
+            shelve.open(str(cache_dir / MAVEN_CACHE_FILE_NAME)) as cache,
+        ):
+            entry = cache.get(key)
+    except Exception as e:
+        logger.debug("Could not read Maven lookup cache: %s", e)
+        return None
+    if not entry or time.time() - entry["cached_at"] > MAVEN_CACHE_TTL_SECONDS:
+        return None
+    return entry["exists"], entry["latest_version"]
+
+
+def _write_maven_cache(
+    cache_dir: Path, key: str, exists: bool, latest_version: str | None
+):
+    try:
+        with (
+            _maven_cache_lock,
+            shelve.open(str(cache_dir / MAVEN_CACHE_FILE_NAME)) as cache,
+        ):
+            cache[key] = {
+                "exists": exists,
+                "latest_version": latest_version,
+                "cached_at": time.time(),
+            }
+    except Exception as e:
+        logger.debug("Could not write Maven lookup cache: %s", e)
+
+
+@functools.lru_cache(maxsize=4096)
+def lookup_maven_artifact(
+    group_id: str, artifact_id: str, cache_dir: Path | None = None
+) -> tuple[bool, str | None]:
+    """
+    Looks up groupId:artifactId on Maven Central and returns (exists, latest_version).
+    Results are memoized in-process and, when cache_dir is given, on disk for
+    MAVEN_CACHE_TTL_SECONDS. Request errors propagate and are never cached.
+    """
+    cache_key = f"{group_id}:{artifact_id}"
+    if cache_dir is not None:
+        cached = _read_maven_cache(cache_dir, cache_key)
+        if cached is not None:
+            logger.debug("Maven lookup cache hit: %s", cache_key)
+            return cached
+
+    query = f'g:"{group_id}" AND a:"{artifact_id}"'
+    params = {"q": query, "core": "gav", "rows": "1", "wt": "json"}
+    logger.debug("Querying Maven Central: %s", params)
+
+    response = SESSION.get(MAVEN_SEARCH_URL, params=params, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    exists = data["response"]["numFound"] > 0
+    latest_version = data["response"]["docs"][0].get("v") if exists else None
+
+    if cache_dir is not None:
+        _write_maven_cache(cache_dir, cache_key, exists, latest_version)
+    return exists, latest_version
+
+
+def verify_maven_dependency(dep_info: dict, cache_dir: Path | None = None) -> dict:
+    """Verifies a parsed dependency against Maven Central Search API.
+    Lookups are cached under cache_dir when it is given.
+    """
     verification_result = {
         "suggestion": dep_info["snippet"],
         "group_id": dep_info["group_id"],
@@ -74,20 +212,12 @@ def verify_maven_dependency(dep_info: dict) -> dict:
         )
         return verification_result
 
-    query = f'g:"{dep_info["group_id"]}" AND a:"{dep_info["artifact_id"]}"'
-    params = {"q": query, "core": "gav", "rows": "1", "wt": "json"}
-    logger.debug(f"Querying Maven Central: {params}")
-
     try:
-        response = requests.get(MAVEN_SEARCH_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if data["response"]["numFound"] > 0:
-            verification_result["exists"] = True
-            latest_version = data["response"]["docs"][0].get("v")
-            verification_result["latest_version"] = latest_version
-        else:
-            verification_result["exists"] = False
+        exists, latest_version = lookup_maven_artifact(
+            dep_info["group_id"], dep_info["artifact_id"], cache_dir
+        )
+        verification_result["exists"] = exists
+        verification_result["latest_version"] = latest_version
 
     except requests.exceptions.Timeout:
         verification_result["error"] = "Timeout connecting to Maven Central"
@@ -1,28 +1,58 @@
-import random
-import time
+import functools
 import google.generativeai as genai
 from google.generativeai.types import Tool, FunctionDeclaration
 from google.api_core import exceptions as google_api_exceptions
+from tenacity import (
+    Retrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_random_exponential,
+)
 from pathlib import Path
 import sys
 import re
 import logging
+import threading
 
 from config import load_api_key, MODEL_NAME
 
 logger = logging.getLogger(__name__)
 
+_FALLBACK_RE = re.compile(r"FallbackFilePath:\s*(.+)\n")
+
+RETRYABLE_API_ERRORS = (
+    google_api_exceptions.InternalServerError,
+    google_api_exceptions.ServiceUnavailable,
+    google_api_exceptions.DeadlineExceeded,
+    google_api_exceptions.ResourceExhausted,
+)
+MAX_RETRY_DELAY_SECONDS = 30
+# Overall budget (measured on the monotonic clock) for one call and its retries.
+MAX_RETRY_DEADLINE_SECONDS = 120
+
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_gemini():
+    """Configures the Gemini API key once; exits if it is missing or invalid."""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        try:
+            genai.configure(api_key=load_api_key())
+            logger.info("Gemini API configured successfully.")
+        except ValueError as e:
+            logger.critical(f"Configuration Error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            logger.critical(f"Unexpected Error configuring Gemini API: {e}")
+            sys.exit(1)
+        _configured = True
 
-try:
-    GOOGLE_API_KEY = load_api_key()
-    genai.configure(api_key=GOOGLE_API_KEY)
-    logger.info("Gemini API configured successfully.")
-except ValueError as e:
-    logger.critical(f"Configuration Error: {e}")
-    sys.exit(1)
-except Exception as e:
-    logger.critical(f"Unexpected Error configuring Gemini API: {e}")
-    sys.exit(1)
 
 write_file_func = FunctionDeclaration(
     name="write_file",
@@ -43,7 +73,9 @@ default_tools = Tool(function_declarations=[write_file_func])
 def safe_write_file(
     output_dir: Path, relative_path: str, content: str, reason: str | None = None
 ):
-    """Safely writes content to a file within the output directory."""
+    """Safely writes content to a file within the output directory.
+    output_dir must already be resolved; it is resolved once by the caller.
+    """
 
     if not relative_path or ".." in Path(relative_path).parts:
         logger.info(
@@ -51,16 +83,14 @@ def safe_write_file(
         )
         return False
     try:
-        output_dir = output_dir.resolve(strict=True)
         target_file = output_dir.joinpath(relative_path).resolve()
-        if not str(target_file).startswith(str(output_dir)):
+        if not target_file.is_relative_to(output_dir):
             logger.info(
                 f"Error: Attempted write outside designated output directory: '{relative_path}'. Skipping."
             )
             return False
         target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_file, "w", encoding="utf-8") as f:
-            f.write(content)
+        target_file.write_bytes(content.encode("utf-8"))
         logger.info(f"Successfully wrote file: {target_file}")
         if reason:
             logger.info(f"  Reason: {reason}")
@@ -75,6 +105,37 @@ def safe_write_file(
         return False
 
 
+@functools.lru_cache(maxsize=4)
+def _get_model(model_name: str) -> genai.GenerativeModel:
+    """Returns a shared GenerativeModel; it holds no per-request state."""
+    return genai.GenerativeModel(model_name)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_retrying(max_retries: int, initial_delay: float) -> Retrying:
+    """Builds the retry policy for Gemini calls once per retry setting.
+    Retrying keeps its per-call state thread-local, so the policy can be shared.
+    """
+
+    def log_retry(retry_state):
+        logger.warning(
+            f"API Error: {retry_state.outcome.exception()}. Retrying in {retry_state.next_action.sleep:.2f} seconds... (Attempt {retry_state.attempt_number}/{max_retries})"
+        )
+
+    return Retrying(
+        retry=retry_if_exception_type(RETRYABLE_API_ERRORS),
+        wait=wait_random_exponential(
+            multiplier=initial_delay, max=MAX_RETRY_DELAY_SECONDS
+        ),
+        stop=(
+            stop_after_attempt(max_retries + 1)
+            | stop_before_delay(MAX_RETRY_DEADLINE_SECONDS)
+        ),
+        before_sleep=log_retry,
+        reraise=True,
+    )
+
+
 def call_gemini_with_tools(
     prompt: str,
     output_dir: Path,
@@ -87,113 +148,92 @@ def call_gemini_with_tools(
     Sends prompt, handles function calls, includes fallback, uses logging,
     and implements retry logic for specific API errors.
     """
+    configure_gemini()
     logger.info(f"Asking Gemini ({model_name})...")
-    logger.debug(f"Full Prompt:\n{prompt}")
+    logger.debug("Full Prompt:\n%s", prompt)
 
-    model = genai.GenerativeModel(model_name)
-    last_exception = None
+    model = _get_model(model_name)
 
-    for attempt in range(max_retries + 1):
-        try:
-            response = model.generate_content(
-                prompt,
-                tools=available_tools,
-            )
-
-            if not response.candidates:
-                logger.error("No response candidates generated (potentially blocked).")
-                logger.debug(f"Prompt Feedback: {response.prompt_feedback}")
-
-                return "Error: No response generated."
-
-            if response.candidates[0].content.parts:
-                part = response.candidates[0].content.parts[0]
-                if part.function_call:
-
-                    fc = part.function_call
-                    logger.info(f"Gemini requested function call: {fc.name}")
-                    args = {k: v for k, v in fc.args.items()}
-                    logger.debug(f"Function call args: {args}")
-                    if fc.name == "write_file":
-                        if "file_path" in args and "content" in args:
-                            safe_write_file(
-                                output_dir,
-                                args["file_path"],
-                                args["content"],
-                                args.get("reason"),
-                            )
-                            return None
-                        else:
-                            logger.error("Missing required args for 'write_file'.")
-                            return (
-                                "Error: Function call 'write_file' missing arguments."
-                            )
-                    else:
-                        logger.warning(f"Received unhandled function call '{fc.name}'.")
-                        return f"Received unhandled function call: {fc.name}"
-
-                elif part.text:
+    retrying = _get_retrying(max_retries, initial_delay)
 
-                    raw_text = part.text
-                    fallback_match = re.match(r"FallbackFilePath:\s*(.+)\n", raw_text)
-                    if fallback_match:
-                        fallback_path = fallback_match.group(1).strip()
-                        fallback_content = (
-                            raw_text.split("\n", 1)[1] if "\n" in raw_text else ""
-                        )
-                        logger.warning(
-                            f"Fallback Detected: LLM provided text with path: {fallback_path}"
-                        )
-                        logger.info("Attempting fallback write...")
+    try:
+        response = retrying(model.generate_content, prompt, tools=available_tools)
+
+        if not response.candidates:
+            logger.error("No response candidates generated (potentially blocked).")
+            logger.debug("Prompt Feedback: %s", response.prompt_feedback)
+
+            return "Error: No response generated."
+
+        if response.candidates[0].content.parts:
+            part = response.candidates[0].content.parts[0]
+            if part.function_call:
+
+                fc = part.function_call
+                logger.info(f"Gemini requested function call: {fc.name}")
+                # fc.args is a read-only Mapping; only copy it when it gets logged.
+                args = fc.args
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Function call args: %s", dict(args))
+                if fc.name == "write_file":
+                    if "file_path" in args and "content" in args:
                         safe_write_file(
                             output_dir,
-                            fallback_path,
-                            fallback_content,
-                            "[Fallback - Review Needed] LLM failed function call",
+                            args["file_path"],
+                            args["content"],
+                            args.get("reason"),
                         )
                         return None
                     else:
-                        logger.info(
-                            "Gemini Text Response received (No Function Call / Fallback)."
-                        )
-                        logger.info(
-                            raw_text[:200] + ("..." if len(raw_text) > 200 else "")
-                        )
-                        logger.debug(f"Full Text Response:\n{raw_text}")
-                        return raw_text
-
+                        logger.error("Missing required args for 'write_file'.")
+                        return "Error: Function call 'write_file' missing arguments."
+                else:
+                    logger.warning(f"Received unhandled function call '{fc.name}'.")
+                    return f"Received unhandled function call: {fc.name}"
+
+            elif part.text:
+
+                raw_text = part.text
+                fallback_match = _FALLBACK_RE.match(raw_text)
+                if fallback_match:
+                    fallback_path = fallback_match.group(1).strip()
+                    fallback_content = (
+                        raw_text.split("\n", 1)[1] if "\n" in raw_text else ""
+                    )
+                    logger.warning(
+                        f"Fallback Detected: LLM provided text with path: {fallback_path}"
+                    )
+                    logger.info("Attempting fallback write...")
+                    safe_write_file(
+                        output_dir,
+                        fallback_path,
+                        fallback_content,
+                        "[Fallback - Review Needed] LLM failed function call",
+                    )
+                    return None
                 else:
-                    logger.error("Received an empty or unexpected response part.")
-                    return "Error: Received an empty or unexpected response part."
-
-            logger.error("Unexpected response structure (no parts?).")
-            return "Error: Unexpected response structure."
-
-        except (
-            google_api_exceptions.InternalServerError,
-            google_api_exceptions.ServiceUnavailable,
-            google_api_exceptions.DeadlineExceeded,
-            google_api_exceptions.ResourceExhausted,
-        ) as e:
-            last_exception = e
-            if attempt < max_retries:
-                delay = initial_delay * (2**attempt) + random.uniform(0, 0.5)
-                logger.warning(
-                    f"API Error: {e}. Retrying in {delay:.2f} seconds... (Attempt {attempt + 1}/{max_retries})"
-                )
-                time.sleep(delay)
+                    logger.info(
+                        "Gemini Text Response received (No Function Call / Fallback)."
+                    )
+                    logger.info(raw_text[:200] + ("..." if len(raw_text) > 200 else ""))
+                    logger.debug("Full Text Response:\n%s", raw_text)
+                    return raw_text
+
             else:
-                logger.error(f"API Error: {e}. Max retries exceeded.")
-                break
-        except Exception as e:
+                logger.error("Received an empty or unexpected response part.")
+                return "Error: Received an empty or unexpected response part."
 
-            last_exception = e
-            logger.error(
-                f"Unexpected Error interacting with Gemini API: {e}", exc_info=True
-            )
-            break
+        logger.error("Unexpected response structure (no parts?).")
+        return "Error: Unexpected response structure."
 
-    logger.error(
-        f"Failed to get successful response from Gemini after {max_retries + 1} attempts."
-    )
-    return f"Error: Failed after retries. Last error: {last_exception}"
+    except RETRYABLE_API_ERRORS as e:
+        logger.error(f"API Error: {e}. Max retries exceeded.")
+        logger.error(
+            f"Failed to get successful response from Gemini after {retrying.statistics['attempt_number']} attempts."
+        )
+        return f"Error: Failed after retries. Last error: {e}"
+    except Exception as e:
+        logger.error(
+            f"Unexpected Error interacting with Gemini API: {e}", exc_info=True
+        )
+        return f"Error: Failed after retries. Last error: {e}"
@@ -1,12 +1,19 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 
 LOG_FILE_NAME = "migration_run.log"
+LOG_FILE_MAX_BYTES = 20 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
 
 
 def setup_logging(log_dir: Path, level=logging.INFO):
-    """Configures logging to file and console."""
+    """Configures logging to file and console.
+    Records are queued by the calling thread and written by a background listener.
+    """
     log_file = log_dir / LOG_FILE_NAME
     log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -18,17 +25,35 @@ def setup_logging(log_dir: Path, level=logging.INFO):
     logger = logging.getLogger()
     logger.setLevel(level)
 
+    handlers = []
     try:
-        file_handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+        # Start each run with a fresh log file, keeping earlier runs as backups.
+        if log_file.exists() and log_file.stat().st_size > 0:
+            file_handler.doRollover()
         file_handler.setFormatter(formatter)
         file_handler.setLevel(level)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except Exception as e:
         print(f"Error setting up file logging to {log_file}: {e}", file=sys.stderr)
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     console_handler.setLevel(level)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
+
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
 
     logger.info(f"Logging initialized. Log file: {log_file}")
@@ -1,18 +1,20 @@
 import argparse
+import os
 import sys
 from pathlib import Path
-import time
 import re
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from config import MAX_CODE_READ_CHARS
 from project_scanner import (
     scan_project_directory,
-    analyze_java_file,
-    extract_imports_from_file,
+    analyze_java_files_cached,
+    extract_imports_from_files,
+    load_analysis_cache,
+    save_analysis_cache,
 )
-from llm_interaction import call_gemini_with_tools
-from dependency_verifier import parse_dependency_snippet, verify_maven_dependency
 from prompts import (
     generate_initial_analysis_prompt,
     generate_dependencies_prompt,
@@ -24,39 +26,91 @@ from prompts import (
 from logging_config import setup_logging, LOG_FILE_NAME
 
 LLM_CALL_DELAY_SECONDS = 2
-MODEL_ANNOTATIONS = {"Entity", "Embeddable", "MappedSuperclass", "Document"}
-SERVICE_ANNOTATIONS = {
-    "Stateless",
-    "Stateful",
-    "Service",
-    "Component",
-    "RequestScoped",
-    "ApplicationScoped",
-    "Controller",
-    "RestController",
-    "Model",
-}
-REST_ANNOTATIONS = {"Path"}
+LLM_MAX_WORKERS = 8
+MAVEN_VERIFY_MAX_WORKERS = 8
+MODEL_ANNOTATIONS = frozenset({"Entity", "Embeddable", "MappedSuperclass", "Document"})
+SERVICE_ANNOTATIONS = frozenset(
+    {
+        "Stateless",
+        "Stateful",
+        "Service",
+        "Component",
+        "RequestScoped",
+        "ApplicationScoped",
+        "Controller",
+        "RestController",
+        "Model",
+    }
+)
+REST_ANNOTATIONS = frozenset({"Path"})
+_DEP_BLOCK_RE = re.compile(r"<dependency>.*?</dependency>", re.DOTALL)
 
 logger = logging.getLogger(__name__)
 
+_llm_call_slots = threading.Semaphore(LLM_MAX_WORKERS)
+
+
+def throttle_llm_call():
+    """Blocks until an LLM call slot is free.
+
+    At most LLM_MAX_WORKERS calls may start within any LLM_CALL_DELAY_SECONDS
+    window; each slot is handed back by a timer once the window has passed.
+    """
+    _llm_call_slots.acquire()
+    release_timer = threading.Timer(LLM_CALL_DELAY_SECONDS, _llm_call_slots.release)
+    release_timer.daemon = True
+    release_timer.start()
+
+
+def _iter_java_files(root: Path):
+    """Yields the paths (as strings) of all .java files under root."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".java"):
+                    yield entry.path
+
 
 def categorize_file(analysis: dict | None) -> str:
     """Categorizes file based on annotations."""
-    if not analysis or not analysis.get("types"):
+    if not analysis or not analysis["types"]["name"]:
         return "unknown"
-    all_annotations = set()
-    for type_info in analysis["types"]:
-        all_annotations.update(type_info.get("annotations", []))
-    if MODEL_ANNOTATIONS.intersection(all_annotations):
+    all_annotations = set().union(*analysis["types"]["annotations"])
+    if not MODEL_ANNOTATIONS.isdisjoint(all_annotations):
         return "model"
-    if SERVICE_ANNOTATIONS.intersection(all_annotations):
+    if not SERVICE_ANNOTATIONS.isdisjoint(all_annotations):
         return "service"
-    if REST_ANNOTATIONS.intersection(all_annotations):
+    if not REST_ANNOTATIONS.isdisjoint(all_annotations):
         return "rest"
     return "other"
 
 
+def parse_unique_dependencies(snippets: list[str]) -> list[dict]:
+    """Parses suggested <dependency> blocks into dependencies worth verifying.
+    Repeated snippets are parsed once and each groupId:artifactId is kept once.
+    """
+    from dependency_verifier import is_placeholder_dependency, parse_dependency_snippet
+
+    unique_deps = {}
+    for snippet in dict.fromkeys(snippets):
+        parsed_dep = parse_dependency_snippet(snippet)
+        if not (parsed_dep and parsed_dep["group_id"] and parsed_dep["artifact_id"]):
+            logger.warning(f"Could not parse suggestion snippet: {snippet[:100]}...")
+            continue
+        if is_placeholder_dependency(parsed_dep):
+            logger.info(
+                f"Skipping placeholder GAV: {parsed_dep['group_id']}:{parsed_dep['artifact_id']}"
+            )
+            continue
+        unique_deps.setdefault(
+            (parsed_dep["group_id"], parsed_dep["artifact_id"]), parsed_dep
+        )
+    return list(unique_deps.values())
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="AI Assistant for migrating Java apps (V9 - Integrated Logging).",
@@ -93,6 +147,13 @@ def main():
         print(f"CRITICAL: Failed to set up logging: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # The Gemini SDK and requests are slow to import, so they are only loaded
+    # once the arguments are valid (keeps --help and usage errors instant).
+    from llm_interaction import call_gemini_with_tools, configure_gemini
+    from dependency_verifier import verify_maven_dependency
+
+    configure_gemini()
+
     logger.info("--- Starting Migration Assistance ---")
     logger.info(f"Source: {source_dir}")
     logger.info(f"Target Framework: {target_framework}")
@@ -111,23 +172,37 @@ def main():
         logger.error(f"Error during project scanning: {e}", exc_info=True)
         sys.exit(1)
 
-    prompt1 = generate_initial_analysis_prompt(project_scan_results, target_framework)
-    logger.info("--- Task: Initial Analysis & Notes ---")
-    response1 = call_gemini_with_tools(prompt1, output_dir)
+    initial_tasks = [
+        (
+            "Initial Analysis & Notes",
+            generate_initial_analysis_prompt(
+                project_scan_results, target_framework, source_dir
+            ),
+        ),
+        (
+            "Generate Dependencies & pom.xml",
+            generate_dependencies_prompt(target_framework),
+        ),
+        ("Generate Configuration File", generate_config_prompt(target_framework)),
+    ]
+
+    def run_initial_task(task_name: str, prompt: str) -> str | None:
+        logger.info(f"--- Task: {task_name} ---")
+        throttle_llm_call()
+        return call_gemini_with_tools(prompt, output_dir)
+
+    # The three setup prompts are independent of each other, so they run together.
+    with ThreadPoolExecutor(max_workers=len(initial_tasks)) as executor:
+        initial_futures = [
+            executor.submit(run_initial_task, task_name, prompt)
+            for task_name, prompt in initial_tasks
+        ]
+    # result() on every task re-raises a failure in any of them, as the
+    # sequential calls did, instead of only checking the first.
+    response1, _, _ = (future.result() for future in initial_futures)
     if response1:
         source_framework_guess = response1
         logger.info("[Info] LLM returned text for initial analysis (check log/file).")
-    time.sleep(LLM_CALL_DELAY_SECONDS)
-
-    prompt2 = generate_dependencies_prompt(target_framework)
-    logger.info("--- Task: Generate Dependencies & pom.xml ---")
-    _ = call_gemini_with_tools(prompt2, output_dir)
-    time.sleep(LLM_CALL_DELAY_SECONDS)
-
-    prompt3 = generate_config_prompt(target_framework)
-    logger.info("--- Task: Generate Configuration File ---")
-    _ = call_gemini_with_tools(prompt3, output_dir)
-    time.sleep(LLM_CALL_DELAY_SECONDS)
 
     logger.info("--- Task: Analyzing, Categorizing & Translating Source Files ---")
     files_to_process = {}
@@ -141,29 +216,32 @@ def main():
         logger.info(
             f"Found {len(java_files_to_scan)} Java files to potentially analyze."
         )
+        analysis_cache = load_analysis_cache(output_dir, source_dir)
+        files_to_analyze = {}
         for file_rel_path in java_files_to_scan:
             normalized_path = Path(file_rel_path).as_posix()
             if normalized_path.startswith("src/test/"):
                 logger.info(f"Skipping test file: {file_rel_path}")
                 skipped_files_count += 1
                 continue
-
             logger.info(f"-- Analyzing: {file_rel_path} --")
-            source_file_path = source_dir / file_rel_path
-            if not source_file_path.is_file():
-                logger.warning(f"Path invalid: {source_file_path}. Skipping.")
-                skipped_files_count += 1
-                continue
+            files_to_analyze[file_rel_path] = source_dir / file_rel_path
 
-            analysis = analyze_java_file(source_file_path)
-            files_to_process[file_rel_path] = analysis
+        # The scan only lists regular files; one that vanished since is
+        # reported by the analysis step and left out of its results.
+        files_to_process = analyze_java_files_cached(files_to_analyze, analysis_cache)
+        skipped_files_count += len(files_to_analyze) - len(files_to_process)
 
+        for file_rel_path in files_to_analyze:
+            if file_rel_path not in files_to_process:
+                continue
+            analysis = files_to_process[file_rel_path]
             if not analysis:
                 failed_analysis_count += 1
                 continue
 
             category = categorize_file(analysis)
-            logger.info(f"  Categorized as: {category}")
+            logger.info(f"  Categorized as {category}: {file_rel_path}")
 
             if category == "model":
                 model_files.append(file_rel_path)
@@ -174,6 +252,37 @@ def main():
             else:
                 other_files.append(file_rel_path)
 
+        save_analysis_cache(output_dir, source_dir, analysis_cache)
+
+        def translate_one(file_rel_path: str, is_model: bool):
+            """Reads, prompts and translates a single source file via the LLM."""
+            logger.info(f"-- Translating: {file_rel_path} --")
+            analysis = files_to_process[file_rel_path]
+            source_file_path = source_dir / file_rel_path
+            # A UTF-8 character is at most 4 bytes, so this bounded read always
+            # covers MAX_CODE_READ_CHARS characters without loading huge files.
+            with source_file_path.open("rb") as f:
+                raw = f.read(MAX_CODE_READ_CHARS * 4 + 1)
+            source_code = raw.decode("utf-8", errors="replace")
+            if len(source_code) > MAX_CODE_READ_CHARS:
+                logger.warning(
+                    f"Source file '{file_rel_path}' is long, truncating for prompt."
+                )
+                source_code = (
+                    source_code[:MAX_CODE_READ_CHARS] + "\n... (code truncated)"
+                )
+
+            translate_prompt = generate_translation_prompt(
+                target_framework=target_framework,
+                source_file_rel_path=file_rel_path,
+                source_code=source_code,
+                source_analysis=analysis,
+                source_framework_guess=source_framework_guess,
+                is_model_file=is_model,
+            )
+            throttle_llm_call()
+            call_gemini_with_tools(translate_prompt, output_dir)
+
         all_batches = [
             ("Models", model_files, True),
             ("App Logic & Others", service_files + rest_files + other_files, False),
@@ -184,46 +293,39 @@ def main():
             logger.info(
                 f"--- Processing Batch: {batch_name} ({len(batch_files)} files) ---"
             )
-            for file_rel_path in batch_files:
-                logger.info(f"-- Translating {batch_name[:-1]}: {file_rel_path} --")
-                analysis = files_to_process[file_rel_path]
-                source_file_path = source_dir / file_rel_path
-                try:
-                    source_code = source_file_path.read_text(encoding="utf-8")
-                    if len(source_code) > MAX_CODE_READ_CHARS:
-                        logger.warning(
-                            f"Source file '{file_rel_path}' is long, truncating for prompt."
+            # Each batch runs to completion before the next one starts so that
+            # translated models exist before the app logic that references them.
+            with ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        translate_one, file_rel_path, is_model_batch
+                    ): file_rel_path
+                    for file_rel_path in batch_files
+                }
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    file_rel_path = futures[future]
+                    try:
+                        future.result()
+                        total_translation_attempts += 1
+                        logger.info(
+                            f"-- Finished {batch_name[:-1]} ({completed}/{len(batch_files)}): {file_rel_path} --"
                         )
-                        source_code = (
-                            source_code[:MAX_CODE_READ_CHARS] + "\n... (code truncated)"
+                    except Exception as e:
+                        logger.error(
+                            f"Error processing file '{file_rel_path}': {e}",
+                            exc_info=True,
                         )
 
-                    translate_prompt = generate_translation_prompt(
-                        target_framework=target_framework,
-                        source_file_rel_path=file_rel_path,
-                        source_code=source_code,
-                        source_analysis=analysis,
-                        source_framework_guess=source_framework_guess,
-                        is_model_file=is_model_batch,
-                    )
-                    call_gemini_with_tools(translate_prompt, output_dir)
-                    total_translation_attempts += 1
-
-                    time.sleep(LLM_CALL_DELAY_SECONDS)
-                except Exception as e:
-                    logger.error(
-                        f"Error processing file '{file_rel_path}': {e}", exc_info=True
-                    )
-
     logger.info("--- Task: Analyzing Imports in Generated Output Files ---")
     all_imports = set()
-    generated_java_files = list(output_dir.rglob("*.java"))
+    generated_java_files = list(_iter_java_files(output_dir))
 
     logger.info(
         f"Found {len(generated_java_files)} .java files in output directory to analyze for imports."
     )
-    for gen_file_path in generated_java_files:
-        imports_in_file = extract_imports_from_file(gen_file_path)
+    for imports_in_file in extract_imports_from_files(
+        [Path(gen_file_path) for gen_file_path in generated_java_files]
+    ):
         all_imports.update(imports_in_file)
 
     if not all_imports:
@@ -241,12 +343,10 @@ def main():
             logger.error("Could not get dependency suggestions from LLM.")
         else:
             logger.info("--- LLM Dependency Suggestions ---")
-            logger.debug(f"Raw dependency suggestions:\n{dependency_suggestions}")
+            logger.debug("Raw dependency suggestions:\n%s", dependency_suggestions)
 
             logger.info("--- Verifying Suggested Dependencies via Maven Central ---")
-            suggested_snippets = re.findall(
-                r"<dependency>.*?</dependency>", dependency_suggestions, re.DOTALL
-            )
+            suggested_snippets = _DEP_BLOCK_RE.findall(dependency_suggestions)
 
             if not suggested_snippets:
                 logger.info("No parsable <dependency> blocks found in the suggestions.")
@@ -254,14 +354,20 @@ def main():
                 logger.info(
                     f"Found {len(suggested_snippets)} suggested dependency blocks to verify."
                 )
-                for snippet in suggested_snippets:
-                    parsed_dep = parse_dependency_snippet(snippet)
-                    if (
-                        parsed_dep
-                        and parsed_dep["group_id"]
-                        and parsed_dep["artifact_id"]
-                    ):
-                        verification = verify_maven_dependency(parsed_dep)
+                deps_to_verify = parse_unique_dependencies(suggested_snippets)
+                logger.info(f"Verifying {len(deps_to_verify)} unique dependencies.")
+                with ThreadPoolExecutor(
+                    max_workers=MAVEN_VERIFY_MAX_WORKERS
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            verify_maven_dependency, parsed_dep, output_dir
+                        ): parsed_dep
+                        for parsed_dep in deps_to_verify
+                    }
+                    for future in as_completed(futures):
+                        parsed_dep = futures[future]
+                        verification = future.result()
                         details = verification["error"] or ""
                         if verification["exists"]:
                             details = f"Latest: {verification['latest_version']}"
@@ -274,12 +380,6 @@ def main():
                                 f"Dependency '{parsed_dep['group_id']}:{parsed_dep['artifact_id']}' not found."
                             )
 
-                    else:
-                        logger.warning(
-                            f"Could not parse suggestion snippet: {snippet[:100]}..."
-                        )
-                    time.sleep(0.5)
-
     logger.info("--- Migration Assistance Script Finished ---")
     logger.info(
         f"Attempted translation for {total_translation_attempts} non-test source files."
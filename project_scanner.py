@@ -1,14 +1,227 @@
+import functools
+import json
+import multiprocessing
 import os
+import re
+import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from pathlib import Path
 import javalang
-from config import MAX_POM_READ_BYTES, MAX_CODE_READ_CHARS
+from config import (
+    MAX_POM_READ_BYTES,
+    MAX_CODE_READ_CHARS,
+    JAVA_PARSER,
+    SCAN_PRUNE_DIRS,
+    SCAN_KEEP_HIDDEN_DIRS,
+    SCAN_MAX_WORKERS,
+)
 import logging
+import logging.handlers
 
 logger = logging.getLogger(__name__)
 
 
+def _java_query_captures(root) -> dict:
+    """Runs the Java query over a tree: capture name -> nodes."""
+    # py-tree-sitter 0.25 moved query execution from Query onto QueryCursor.
+    if _QueryCursor is not None:
+        return _QueryCursor(_JAVA_QUERY).captures(root)
+    return _JAVA_QUERY.captures(root)
+
+
+try:
+    import tree_sitter
+    import tree_sitter_java
+
+    JAVA_LANGUAGE = tree_sitter.Language(tree_sitter_java.language())
+    _java_parser = tree_sitter.Parser(JAVA_LANGUAGE)
+    # Compiled once; matching runs in C and only returns the top-level package,
+    # import and type declaration nodes.
+    _JAVA_QUERY = tree_sitter.Query(
+        JAVA_LANGUAGE,
+        """
+        (program (package_declaration [(scoped_identifier) (identifier)] @package))
+        (program (import_declaration [(scoped_identifier) (identifier)] @import))
+        (program [
+          (class_declaration)
+          (interface_declaration)
+          (enum_declaration)
+          (annotation_type_declaration)
+          (record_declaration)
+        ] @type)
+        """,
+    )
+    _QueryCursor = getattr(tree_sitter, "QueryCursor", None)
+    # Older bindings differ in ways a probe of the API would miss (0.22's
+    # Query.captures returns a list of tuples), so check a real result.
+    _probe = _java_query_captures(
+        _java_parser.parse(b"package a; import b.C; class D {}").root_node
+    )
+    if not isinstance(_probe, dict) or sorted(_probe) != ["import", "package", "type"]:
+        raise RuntimeError(
+            f"unexpected tree-sitter query result ({type(_probe).__name__})"
+        )
+    del _probe
+except Exception as e:
+    # Missing bindings, or a tree-sitter / tree-sitter-java pair that does not
+    # fit together (e.g. Language() raising TypeError): use javalang instead.
+    if not isinstance(e, ImportError):
+        logger.warning(f"tree-sitter is unusable ({e!r}); falling back to javalang.")
+    JAVA_LANGUAGE = None
+    _java_parser = None
+    _JAVA_QUERY = None
+    _QueryCursor = None
+
+# Name of the parser backing analyze_java_file; results differ slightly between
+# the two (tree-sitter keeps qualified type names and understands records).
+JAVA_PARSER_BACKEND = (
+    "tree-sitter"
+    if _java_parser is not None and JAVA_PARSER != "javalang"
+    else "javalang"
+)
+
+# tree-sitter node types mapped to the javalang class names used as "kind".
+_TS_TYPE_KINDS = {
+    "class_declaration": "ClassDeclaration",
+    "interface_declaration": "InterfaceDeclaration",
+    "enum_declaration": "EnumDeclaration",
+    "annotation_type_declaration": "AnnotationDeclaration",
+    "record_declaration": "RecordDeclaration",
+}
+_TS_ANNOTATION_TYPES = frozenset({"marker_annotation", "annotation"})
+
+BUILD_FILES = frozenset({"pom.xml", "build.gradle", "build.gradle.kts"})
+CONFIG_FILES = frozenset(
+    {
+        "web.xml",
+        "persistence.xml",
+        "ejb-jar.xml",
+        "beans.xml",
+        "application.xml",
+        "standalone.xml",
+        "domain.xml",
+    }
+)
+
+SRC_MAIN_JAVA_PATH = os.path.join("src", "main", "java")
+SRC_MAIN_KOTLIN_PATH = os.path.join("src", "main", "kotlin")
+
+# Below this many files, worker start-up costs more than parsing in-process.
+PARALLEL_PARSE_MIN_FILES = 32
+PARSE_CHUNKSIZE = 16
+
+# Matches "import [static] a.b.C[.*];" lines. Like javalang, the captured path
+# excludes a trailing wildcard.
+_IMPORT_RE = re.compile(
+    rb"^\s*import\s+(?:static\s+)?([\w$]+(?:\.[\w$]+)*)(?:\.\*)?\s*;",
+    re.MULTILINE,
+)
+
+ANALYSIS_CACHE_FILE_NAME = ".analysis_cache.json"
+# Bump whenever the shape of analyze_java_file results changes.
+ANALYSIS_CACHE_VERSION = 2
+
+
+def _read_pom_xml(pom_path: str, max_bytes: int) -> str:
+    """Reads the start of a pom.xml, marking the content if it was cut short."""
+    # One unbuffered read; the extra byte tells a file of exactly max_bytes
+    # apart from a longer one.
+    fd = os.open(pom_path, os.O_RDONLY)
+    try:
+        data = os.read(fd, max_bytes + 1)
+    finally:
+        os.close(fd)
+    content = data[:max_bytes].decode("utf-8", "ignore")
+    if len(data) > max_bytes:
+        content += "\n... (file truncated)"
+    return content
+
+
+def _should_descend(dir_name: str, at_build_root: bool) -> bool:
+    """
+    Whether the project scan walks into a directory with this name. Hidden
+    directories are skipped anywhere unless in SCAN_KEEP_HIDDEN_DIRS;
+    SCAN_PRUNE_DIRS names only at a build root, where they are build output
+    rather than e.g. a Java package.
+    """
+    if dir_name[0] == ".":
+        return dir_name in SCAN_KEEP_HIDDEN_DIRS
+    return not (at_build_root and dir_name in SCAN_PRUNE_DIRS)
+
+
+def _is_build_root(filenames, is_project_root: bool) -> bool:
+    """The project root, or a module directory holding a build file."""
+    return is_project_root or not BUILD_FILES.isdisjoint(filenames)
+
+
+def _walk_serial(source_dir: Path):
+    """
+    Yields (dirpath, dirnames, filenames) for every directory the scan walks,
+    listing every subdirectory but only descending into those
+    _should_descend allows. filenames holds regular files only.
+    """
+    stack = [(str(source_dir), True)]
+    while stack:
+        dirpath, dirnames, filenames, descend = _list_directory(*stack.pop())
+        stack.extend((os.path.join(dirpath, name), False) for name in descend)
+        yield dirpath, dirnames, filenames
+
+
+def _list_directory(dirpath: str, is_project_root: bool = False) -> tuple:
+    """
+    Returns (dirpath, dirnames, filenames, names to descend into) for one
+    directory. Entries that are neither directories nor regular files
+    (dangling symlinks, FIFOs, sockets) are left out.
+    """
+    dirnames = []
+    filenames = []
+    real_dirnames = []
+    try:
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirnames.append(entry.name)
+                    if not entry.is_symlink():
+                        real_dirnames.append(entry.name)
+                elif entry.is_file():
+                    filenames.append(entry.name)
+    except OSError as e:
+        # An unreadable directory is skipped rather than failing the scan.
+        logger.debug("Could not list %s: %s", dirpath, e)
+    at_build_root = _is_build_root(filenames, is_project_root)
+    descend = [name for name in real_dirnames if _should_descend(name, at_build_root)]
+    return dirpath, dirnames, filenames, descend
+
+
+def _walk_threaded(source_dir: Path, max_workers: int):
+    """
+    Like _walk_serial, but lists directories on a thread pool so the
+    directory-listing syscalls of many directories overlap. Results are
+    yielded to the calling thread in completion order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_list_directory, str(source_dir), True)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dirpath, dirnames, filenames, descend = future.result()
+                for name in descend:
+                    pending.add(
+                        executor.submit(_list_directory, os.path.join(dirpath, name))
+                    )
+                yield dirpath, dirnames, filenames
+
+
 def scan_project_directory(source_dir: Path) -> dict:
-    """Scans the source directory. (Code unchanged from previous version)"""
+    """
+    Scans the source directory, recording its directories, regular files,
+    Java sources, build/config files and the path of its root pom.xml.
+    """
     logger.info(f"\nScanning project directory: {source_dir}...")
     findings = {
         "files_found": [],
@@ -17,9 +230,8 @@ def scan_project_directory(source_dir: Path) -> dict:
         "potential_build_files": [],
         "potential_config_files": [],
         "src_main_java_exists": False,
-        "pom_xml_content": None,
+        "pom_xml_path": None,
     }
-    max_pom_read_bytes = MAX_POM_READ_BYTES
 
     if not source_dir.is_dir():
         logger.info(
@@ -27,42 +239,47 @@ def scan_project_directory(source_dir: Path) -> dict:
         )
         raise FileNotFoundError(f"Source directory '{source_dir}' not found.")
 
-    for item in source_dir.rglob("*"):
-        if item.is_file():
-            relative_path_str = str(item.relative_to(source_dir))
-            findings["files_found"].append(relative_path_str)
-            if item.name.endswith(".java"):
-                findings["java_files"].append(relative_path_str)
-            if item.name == "pom.xml":
-                findings["potential_build_files"].append(relative_path_str)
-                try:
-                    with open(item, "r", encoding="utf-8", errors="ignore") as f:
-                        findings["pom_xml_content"] = f.read(max_pom_read_bytes)
-                        if len(findings["pom_xml_content"]) == max_pom_read_bytes:
-                            findings["pom_xml_content"] += "\n... (file truncated)"
-                except Exception as e:
-                    logger.info(f"Warning: Could not read {item.name}: {e}")
-            elif item.name == "build.gradle" or item.name == "build.gradle.kts":
-                findings["potential_build_files"].append(relative_path_str)
-            elif item.name in [
-                "web.xml",
-                "persistence.xml",
-                "ejb-jar.xml",
-                "beans.xml",
-                "application.xml",
-                "standalone.xml",
-                "domain.xml",
-            ]:
-                findings["potential_config_files"].append(relative_path_str)
-        elif item.is_dir():
-            relative_dir = str(item.relative_to(source_dir))
-            findings["directories_found"].append(relative_dir)
-            src_java_path = os.path.join("src", "main", "java")
-            src_kotlin_path = os.path.join("src", "main", "kotlin")
-            if relative_dir.startswith(src_java_path) or relative_dir.startswith(
-                src_kotlin_path
-            ):
-                findings["src_main_java_exists"] = True
+    source_prefix = os.path.join(str(source_dir), "")
+    prefix_len = len(source_prefix)
+    # Bound appends keep the per-entry loop free of dict and attribute lookups.
+    files_add = findings["files_found"].append
+    java_add = findings["java_files"].append
+    build_add = findings["potential_build_files"].append
+    cfg_add = findings["potential_config_files"].append
+    dirs_add = findings["directories_found"].append
+    walk = (
+        _walk_threaded(source_dir, SCAN_MAX_WORKERS)
+        if SCAN_MAX_WORKERS > 1
+        else _walk_serial(source_dir)
+    )
+    for dirpath, dirnames, filenames in walk:
+        rel_dir = dirpath[prefix_len:]
+        rel_prefix = rel_dir + os.sep if rel_dir else ""
+        for name in dirnames:
+            dirs_add(rel_prefix + name)
+        for name in filenames:
+            relative_path_str = rel_prefix + name
+            files_add(relative_path_str)
+            if name in BUILD_FILES:
+                build_add(relative_path_str)
+            elif name in CONFIG_FILES:
+                cfg_add(relative_path_str)
+            elif name.endswith(".java"):
+                java_add(relative_path_str)
+
+    # The shallowest pom.xml, i.e. the root pom of a multi-module project.
+    findings["pom_xml_path"] = min(
+        (
+            build_file
+            for build_file in findings["potential_build_files"]
+            if os.path.basename(build_file) == "pom.xml"
+        ),
+        key=lambda pom_path: (pom_path.count(os.sep), pom_path),
+        default=None,
+    )
+    findings["src_main_java_exists"] = os.path.isdir(
+        source_prefix + SRC_MAIN_JAVA_PATH
+    ) or os.path.isdir(source_prefix + SRC_MAIN_KOTLIN_PATH)
 
     logger.info(
         f"Found {len(findings['files_found'])} files ({len(findings['java_files'])} Java files) and {len(findings['directories_found'])} directories."
@@ -76,132 +293,369 @@ def scan_project_directory(source_dir: Path) -> dict:
     return findings
 
 
+def get_pom_xml_content(scan_results: dict, source_dir: Path) -> str | None:
+    """
+    Reads the start of the pom.xml found by scan_project_directory, or
+    returns None if the project has none or it cannot be read.
+    """
+    pom_rel_path = scan_results.get("pom_xml_path")
+    if not pom_rel_path:
+        return None
+    try:
+        return _read_pom_xml(os.path.join(source_dir, pom_rel_path), MAX_POM_READ_BYTES)
+    except Exception as e:
+        logger.warning("Could not read %s: %s", pom_rel_path, e)
+        return None
+
+
+def _summarize_type_declaration(type_decl) -> tuple:
+    """Returns (kind, name, annotations, extends, implements) for a javalang type."""
+    annotations = ()
+    if type_decl.annotations:
+        annotations = tuple(sys.intern(a.name) for a in type_decl.annotations)
+
+    # Only some declaration kinds have these attributes, so read them once
+    # with a default instead of probing with hasattr.
+    extends = getattr(type_decl, "extends", None) or None
+    if isinstance(extends, list):
+        extends = tuple(ext.name for ext in extends)
+    elif extends is not None:
+        extends = getattr(extends, "name", None) or str(extends)
+
+    implements = tuple(
+        impl.name
+        for impl in getattr(type_decl, "implements", None) or ()
+        if getattr(impl, "name", None)
+    )
+
+    kind = sys.intern(type(type_decl).__name__)
+    return kind, type_decl.name, annotations, extends, implements
+
+
+def _ts_text(node) -> str:
+    return node.text.decode("utf-8", "ignore")
+
+
+def _ts_interned_text(node) -> str:
+    """_ts_text for values repeated across files (annotations, imports)."""
+    return sys.intern(_ts_text(node))
+
+
+def _ts_type_name(type_node) -> str:
+    """Returns a type's name without type arguments (Base<T> -> Base)."""
+    if type_node.type == "generic_type":
+        type_node = type_node.named_children[0]
+    return _ts_text(type_node)
+
+
+def _ts_type_list_names(node) -> tuple:
+    """Returns the type names listed in a superclass/interfaces clause."""
+    names = []
+    for child in node.named_children:
+        if child.type == "type_list":
+            names.extend(_ts_type_name(t) for t in child.named_children)
+    return tuple(names)
+
+
+def _summarize_ts_type_declaration(decl) -> tuple:
+    """Like _summarize_type_declaration, for a tree-sitter declaration node."""
+    annotations = ()
+    extends = None
+    implements = ()
+    for child in decl.children:
+        if child.type == "modifiers":
+            annotations = tuple(
+                _ts_interned_text(m.child_by_field_name("name"))
+                for m in child.named_children
+                if m.type in _TS_ANNOTATION_TYPES
+            )
+        elif child.type == "superclass":
+            extends = _ts_type_name(child.named_children[0])
+        elif child.type == "extends_interfaces":
+            extends = _ts_type_list_names(child)
+        elif child.type == "super_interfaces":
+            implements = _ts_type_list_names(child)
+    name = _ts_text(decl.child_by_field_name("name"))
+    return _TS_TYPE_KINDS[decl.type], name, annotations, extends, implements
+
+
+def _ts_in_source_order(nodes) -> list:
+    """Query captures are grouped per pattern; this restores file order."""
+    return sorted(nodes, key=lambda n: n.start_byte)
+
+
+def _parse_with_tree_sitter(data: bytes) -> tuple:
+    """Returns (package, imports, types) for Java source using tree-sitter-java."""
+    root = _java_parser.parse(data).root_node
+    if root.has_error:
+        # Keep javalang's contract: a file that does not parse is not analyzed.
+        raise ValueError("tree-sitter found syntax errors")
+    captures = _java_query_captures(root)
+    packages = captures.get("package")
+    package = _ts_text(packages[0]) if packages else None
+    imports = tuple(
+        _ts_interned_text(n) for n in _ts_in_source_order(captures.get("import", ()))
+    )
+    types = tuple(
+        _summarize_ts_type_declaration(n)
+        for n in _ts_in_source_order(captures.get("type", ()))
+    )
+    return package, imports, types
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_java_file_cached(path_str: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Parses a Java file once per (path, mtime, size) so analyze_java_file and
+    extract_imports_from_file share a single parse (tree-sitter or javalang).
+    Returns (package, imports, types) built from tuples so the cached value
+    cannot be mutated by callers.
+    """
+    data = Path(path_str).read_bytes()
+    if JAVA_PARSER_BACKEND == "tree-sitter":
+        return _parse_with_tree_sitter(data)
+    tree = javalang.parse.parse(data.decode("utf-8", "ignore"))
+    package = tree.package.name if tree.package else None
+    imports = tuple(sys.intern(imp.path) for imp in tree.imports)
+    types = tuple(_summarize_type_declaration(t) for t in tree.types or ())
+    return package, imports, types
+
+
 def analyze_java_file(file_path: Path) -> dict | None:
     """
     Parses a single Java file using javalang and extracts basic structural info,
     including top-level type annotations.
+    "types" holds one parallel list per field (kind, name, annotations,
+    extends, implements), with index i describing the file's i-th type.
     Returns a dictionary with info, or None if parsing fails.
     """
-    logger.info(f"Analyzing Java file structure: {file_path.name}...")
-    if not file_path.is_file():
-        logger.info(f"Error: Java file not found: {file_path}")
-        return None
+    logger.debug("Analyzing Java file structure: %s", file_path.name)
 
     analysis_results = {
         "file_path": str(file_path),
         "package": None,
         "imports": [],
-        "types": [],
+        "types": {
+            "kind": [],
+            "name": [],
+            "annotations": [],
+            "extends": [],
+            "implements": [],
+        },
     }
 
     try:
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
-        if len(content) > MAX_CODE_READ_CHARS * 2:
-            logger.info(
-                f"Warning: File {file_path.name} is very large, parsing might be slow."
+        st = os.stat(file_path)
+        if st.st_size > MAX_CODE_READ_CHARS * 2:
+            logger.warning(
+                "File %s is very large, parsing might be slow.", file_path.name
+            )
+
+        package, imports, types = _parse_java_file_cached(
+            str(file_path), st.st_mtime_ns, st.st_size
+        )
+        analysis_results["package"] = package
+        analysis_results["imports"] = list(imports)
+        type_columns = analysis_results["types"]
+        for kind, name, annotations, extends, implements in types:
+            type_columns["kind"].append(kind)
+            type_columns["name"].append(name)
+            type_columns["annotations"].append(list(annotations))
+            type_columns["extends"].append(
+                list(extends) if isinstance(extends, tuple) else extends
             )
+            type_columns["implements"].append(list(implements))
 
-        tree = javalang.parse.parse(content)
-
-        if tree.package:
-            analysis_results["package"] = tree.package.name
-        analysis_results["imports"] = [imp.path for imp in tree.imports]
-
-        if tree.types:
-            for type_decl in tree.types:
-                annotations = []
-                if type_decl.annotations:
-                    annotations = [a.name for a in type_decl.annotations]
-
-                type_info = {
-                    "kind": type(type_decl).__name__,
-                    "name": type_decl.name,
-                    "annotations": annotations,
-                    "extends": None,
-                    "implements": [],
-                }
-
-                if hasattr(type_decl, "extends") and type_decl.extends:
-                    if isinstance(type_decl.extends, list):
-                        type_info["extends"] = [ext.name for ext in type_decl.extends]
-                    elif type_decl.extends:
-
-                        if hasattr(type_decl.extends, "name"):
-                            type_info["extends"] = type_decl.extends.name
-                        else:
-                            type_info["extends"] = str(type_decl.extends)
-
-                if hasattr(type_decl, "implements") and type_decl.implements:
-                    type_info["implements"] = [
-                        impl.name
-                        for impl in type_decl.implements
-                        if hasattr(impl, "name")
-                    ]
-
-                analysis_results["types"].append(type_info)
-
-        type_names = [t["name"] for t in analysis_results["types"]]
-        logger.info(f"  Found types: {', '.join(type_names) if type_names else 'None'}")
-        for t in analysis_results["types"]:
-            if t["annotations"]:
-                logger.info(f"    Annotations on {t['name']}: {t['annotations']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            type_names = type_columns["name"]
+            logger.debug("  Found types: %s", ", ".join(type_names) or "None")
+            for name, annotations in zip(type_names, type_columns["annotations"]):
+                if annotations:
+                    logger.debug("    Annotations on %s: %s", name, annotations)
 
         return analysis_results
 
     except FileNotFoundError:
-        logger.info(f"Error: File not found during analysis: {file_path}")
+        logger.error("File not found during analysis: %s", file_path)
         return None
     except javalang.tokenizer.LexerError as e:
-        logger.info(
-            f"Error: Lexer error parsing {file_path.name}: {e}. Skipping analysis."
+        logger.error(
+            "Lexer error parsing %s: %s. Skipping analysis.", file_path.name, e
         )
         return None
     except Exception as e:
-        logger.info(
-            f"Error: Failed to parse or analyze {file_path.name}: {e}. Skipping analysis."
+        logger.error(
+            "Failed to parse or analyze %s: %s. Skipping analysis.", file_path.name, e
         )
         return None
 
 
+def load_analysis_cache(cache_dir: Path, source_dir: Path) -> dict:
+    """Loads cached analyze_java_file results for source_dir (empty if none)."""
+    cache_file = cache_dir / ANALYSIS_CACHE_FILE_NAME
+    try:
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable analysis cache {cache_file}: {e}")
+        return {}
+    if (
+        data.get("version") != ANALYSIS_CACHE_VERSION
+        or data.get("parser") != JAVA_PARSER_BACKEND
+        or data.get("source_dir") != str(source_dir)
+    ):
+        return {}
+    return data.get("files", {})
+
+
+def save_analysis_cache(cache_dir: Path, source_dir: Path, cache: dict):
+    """Persists analysis results so unchanged files are not re-parsed next run."""
+    cache_file = cache_dir / ANALYSIS_CACHE_FILE_NAME
+    data = {
+        "version": ANALYSIS_CACHE_VERSION,
+        "parser": JAVA_PARSER_BACKEND,
+        "source_dir": str(source_dir),
+        "files": cache,
+    }
+    try:
+        cache_file.write_text(json.dumps(data), encoding="utf-8")
+    except Exception as e:
+        logger.warning(f"Could not write analysis cache {cache_file}: {e}")
+
+
+def analyze_java_files_cached(files: dict[str, Path], cache: dict) -> dict:
+    """
+    Analyzes files (cache key -> path), re-parsing only those whose mtime or
+    size changed since their entry in cache, and updates cache in place so it
+    only holds this call's successful analyses, ready for save_analysis_cache.
+    Returns cache key -> analysis (None if parsing failed); files that no
+    longer exist are left out.
+    """
+    results = {}
+    stale = {}
+    for cache_key, file_path in files.items():
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            logger.warning(f"Path invalid: {file_path}. Skipping.")
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cache.get(cache_key)
+        if entry and entry["stamp"] == stamp:
+            results[cache_key] = entry["analysis"]
+        else:
+            stale[cache_key] = (file_path, stamp)
+
+    analyses = analyze_java_files([file_path for file_path, _ in stale.values()])
+    for (cache_key, (_, stamp)), analysis in zip(stale.items(), analyses):
+        results[cache_key] = analysis
+        cache[cache_key] = {"stamp": stamp, "analysis": analysis}
+
+    # Drop files that are gone or no longer analyzed, and failures: those may
+    # come from the environment (e.g. parser bindings), so they are retried
+    # next run instead of being cached.
+    for cache_key in [
+        cache_key for cache_key in cache if results.get(cache_key) is None
+    ]:
+        del cache[cache_key]
+    return results
+
+
+def _init_parse_worker(log_queue, log_level: int):
+    """Sends a worker process's log records back to the parent process."""
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+
+
+def _map_files_in_processes(func, file_paths: list[Path]) -> list:
+    """
+    Returns [func(path) for path in file_paths], fanned out across worker
+    processes for large batches since javalang parsing is CPU-bound.
+    """
+    if len(file_paths) < PARALLEL_PARSE_MIN_FILES:
+        return [func(file_path) for file_path in file_paths]
+
+    # spawn avoids forking a process that already runs logging/LLM threads.
+    mp_context = multiprocessing.get_context("spawn")
+    log_queue = mp_context.Queue()
+    # Records from the workers are replayed through the parent's root logger.
+    log_listener = logging.handlers.QueueListener(log_queue, logging.getLogger())
+    log_listener.start()
+    max_workers = min(os.cpu_count() or 1, len(file_paths))
+    chunksize = max(1, min(PARSE_CHUNKSIZE, len(file_paths) // max_workers))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_parse_worker,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel()),
+        ) as executor:
+            return list(executor.map(func, file_paths, chunksize=chunksize))
+    finally:
+        log_listener.stop()
+
+
+def analyze_java_files(file_paths: list[Path]) -> list[dict | None]:
+    """Runs analyze_java_file over many files, in parallel for large batches."""
+    return _map_files_in_processes(analyze_java_file, file_paths)
+
+
+def extract_imports_from_files(file_paths: list[Path]) -> list[set[str]]:
+    """Runs extract_imports_from_file over many files, in parallel for large batches."""
+    return _map_files_in_processes(extract_imports_from_file, file_paths)
+
+
 def extract_imports_from_file(file_path: Path) -> set[str]:
     """
     Parses a Java file and extracts the set of unique import statements.
     """
     imports = set()
-    if not file_path.is_file():
-        logger.info(f"Warning: Cannot extract imports, file not found: {file_path}")
-        return imports
-
-    logger.info(f"Extracting imports from: {file_path.name}...")
+    logger.debug("Extracting imports from: %s", file_path.name)
     try:
 
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
+        data = file_path.read_bytes()
 
-        if not content.strip():
-            logger.info(
-                f"Warning: File is empty, skipping import extraction: {file_path.name}"
+        if not data.strip():
+            logger.warning(
+                "File is empty, skipping import extraction: %s", file_path.name
             )
             return imports
 
-        tree = javalang.parse.parse(content)
-        if tree.imports:
-            imports.update(imp.path for imp in tree.imports)
-        logger.info(f"  Found {len(imports)} unique imports in this file.")
+        if b"import" in data:
+            imports.update(
+                sys.intern(match.group(1).decode("utf-8", "ignore"))
+                for match in _IMPORT_RE.finditer(data)
+            )
+            if not imports:
+                # "import" appears but not as a plain statement line (comments,
+                # unusual layout), so let the full parser decide.
+                st = os.stat(file_path)
+                _, parsed_imports, _ = _parse_java_file_cached(
+                    str(file_path), st.st_mtime_ns, st.st_size
+                )
+                imports.update(parsed_imports)
+        logger.debug("  Found %d unique imports in %s.", len(imports), file_path.name)
         return imports
 
     except FileNotFoundError:
 
-        logger.info(f"Warning: File not found during import extraction: {file_path}")
+        logger.warning("File not found during import extraction: %s", file_path)
         return imports
     except javalang.tokenizer.LexerError as e:
-        logger.info(
-            f"Warning: Lexer error parsing {file_path.name} for imports: {e}. Imports might be incomplete."
+        logger.warning(
+            "Lexer error parsing %s for imports: %s. Imports might be incomplete.",
+            file_path.name,
+            e,
         )
 
         return set()
     except Exception as e:
 
-        logger.info(
-            f"Warning: Failed to parse {file_path.name} for imports: {e}. Imports might be incomplete."
+        logger.warning(
+            "Failed to parse %s for imports: %s. Imports might be incomplete.",
+            file_path.name,
+            e,
         )
         return set()
@@ -1,14 +1,34 @@
-def generate_initial_analysis_prompt(scan_results: dict, target_framework: str) -> str:
+import functools
+from pathlib import Path
+
+from project_scanner import get_pom_xml_content
+
+
+def generate_initial_analysis_prompt(
+    scan_results: dict, target_framework: str, source_dir: Path
+) -> str:
     """Generates the prompt for initial project analysis and challenges."""
-    context = f"""
-Analyze the structure of a Java project. Key findings during scan:
-- Potential build files found: {scan_results['potential_build_files']}
-- Potential config files found: {scan_results['potential_config_files']}
-- Java source structure exists: {scan_results['src_main_java_exists']}
-- Java files count: {len(scan_results['java_files'])}
-"""
-    if scan_results.get("pom_xml_content"):
-        context += f"\n- Start of pom.xml content:\n```xml\n{scan_results['pom_xml_content']}\n```\n"
+    context_parts = [
+        "",
+        "Analyze the structure of a Java project. Key findings during scan:",
+        f"- Potential build files found: {scan_results['potential_build_files']}",
+        f"- Potential config files found: {scan_results['potential_config_files']}",
+        f"- Java source structure exists: {scan_results['src_main_java_exists']}",
+        f"- Java files count: {len(scan_results['java_files'])}",
+        "",
+    ]
+    pom_xml_content = get_pom_xml_content(scan_results, source_dir)
+    if pom_xml_content:
+        context_parts.extend(
+            (
+                "- Start of pom.xml content:",
+                "```xml",
+                pom_xml_content,
+                "```",
+                "",
+            )
+        )
+    context = "\n".join(context_parts)
 
     prompt = f"""{context}
 TASK:
@@ -59,42 +79,13 @@ CRITICAL INSTRUCTION: You MUST use the 'write_file' function to save this config
     return prompt
 
 
-def generate_translation_prompt(
-    target_framework: str,
-    source_file_rel_path: str,
-    source_code: str,
-    source_analysis: dict | None,
-    source_framework_guess: str = "Java EE / Unknown",
-    is_model_file: bool = False,
-) -> str:
-    """Generates the prompt for translating a specific Java file.
-    Includes schema recommendations for model files and fallback instruction.
+@functools.lru_cache(maxsize=8)
+def _translation_template(target_framework: str, is_model_file: bool) -> tuple:
+    """
+    Returns the static text of the translation prompt for one target and file
+    kind, split where the per-file values go: before the framework guess, the
+    source path, the analysis context, the source code, and the closing text.
     """
-
-    analysis_context = "No structural analysis available for source file."
-    if source_analysis:
-        type_summaries = []
-        for t in source_analysis.get("types", []):
-            summary = f"  - {t.get('kind', 'N/A')} {t.get('name', 'N/A')}"
-            extends_info = t.get("extends")
-            if extends_info:
-                extends_str = (
-                    ", ".join(extends_info)
-                    if isinstance(extends_info, list)
-                    else extends_info
-                )
-                summary += f" extends {extends_str}"
-            implements_info = t.get("implements")
-            if implements_info:
-                summary += f" implements {', '.join(implements_info)}"
-            type_summaries.append(summary)
-        analysis_context = f"""
-Source File Structural Analysis ({source_analysis.get('file_path', source_file_rel_path)}):
-- Package: {source_analysis.get('package', 'N/A')}
-- Imports Count: {len(source_analysis.get('imports', []))}
-- Detected Types:
-{chr(10).join(type_summaries) if type_summaries else '    None'}"""
-
     schema_instructions = ""
     if is_model_file:
         schema_instructions = """
@@ -103,17 +94,21 @@ Source File Structural Analysis ({source_analysis.get('file_path', source_file_r
      - Suggest appropriate @Indexed annotations on fields commonly used for filtering or sorting to optimize query performance, beyond the primary @Id. Explain why these indexes are suggested.
 """
 
-    prompt = f"""
+    return (
+        """
 CONTEXT:
-- Source Project Framework (estimated): {source_framework_guess}
+- Source Project Framework (estimated): """,
+        f"""
 - Target Project Framework: {target_framework}
 - Target Database: MongoDB
-- Source File Relative Path: {source_file_rel_path}
-{analysis_context}
+- Source File Relative Path: """,
+        "\n",
+        """
 
 SOURCE CODE to translate:
 ```java
-{source_code}
+""",
+        f"""
 TASK:
 
 Analyze the source code. What is its likely role (e.g., JPA Entity, EJB Service Bean, Servlet, Utility class)? Use this analysis as the 'reason' argument later.
@@ -128,9 +123,61 @@ CRITICAL INSTRUCTION: You MUST use the 'write_file' function to save the complet
 FALLBACK INSTRUCTION: If, for some reason, you absolutely cannot use the 'write_file' function call, then start your response immediately with a single line exactly like this:
 FallbackFilePath: [intended relative output path, e.g., src/main/java/com/migratedapp/model/MyModel.java]
 Followed by a newline, and then the complete translated code block.
-"""
+""",
+    )
 
-    return prompt
+
+def generate_translation_prompt(
+    target_framework: str,
+    source_file_rel_path: str,
+    source_code: str,
+    source_analysis: dict | None,
+    source_framework_guess: str = "Java EE / Unknown",
+    is_model_file: bool = False,
+) -> str:
+    """Generates the prompt for translating a specific Java file.
+    Includes schema recommendations for model files and fallback instruction.
+    """
+
+    analysis_context = "No structural analysis available for source file."
+    if source_analysis:
+        type_summaries = []
+        types = source_analysis["types"]
+        for kind, name, extends_info, implements_info in zip(
+            types["kind"], types["name"], types["extends"], types["implements"]
+        ):
+            summary_parts = [f"  - {kind} {name}"]
+            if extends_info:
+                extends_str = (
+                    ", ".join(extends_info)
+                    if isinstance(extends_info, list)
+                    else extends_info
+                )
+                summary_parts.append(f" extends {extends_str}")
+            if implements_info:
+                summary_parts.append(f" implements {', '.join(implements_info)}")
+            type_summaries.append("".join(summary_parts))
+        analysis_context = f"""
+Source File Structural Analysis ({source_analysis.get('file_path', source_file_rel_path)}):
+- Package: {source_analysis.get('package', 'N/A')}
+- Imports Count: {len(source_analysis.get('imports', []))}
+- Detected Types:
+{chr(10).join(type_summaries) if type_summaries else '    None'}"""
+
+    parts = _translation_template(target_framework, is_model_file)
+    return "".join(
+        (
+            parts[0],
+            source_framework_guess,
+            parts[1],
+            source_file_rel_path,
+            parts[2],
+            analysis_context,
+            parts[3],
+            source_code,
+            parts[4],
+        )
+    )
 
 
 def generate_dependency_suggestions_prompt(imports: set[str]) -> str: